@@ -1,6 +1,6 @@
-from feedback_forge_sdk.sdk import DocumentProcessingSDK
+from feedback_forge_sdk.sdk import get_sdk
 
-sdk = DocumentProcessingSDK(config_path="env.yaml")
+sdk = get_sdk(config_path="env.yaml")
 sdk.authenticate()
 
 test_urls = [
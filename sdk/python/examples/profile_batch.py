@@ -0,0 +1,73 @@
+"""Profile a document batch against a local stub of the Feedback Forge API.
+
+Usage:
+    python examples/profile_batch.py [NUM_URLS]
+
+Prints the top functions by cumulative time. cProfile only sees the calling
+thread, which covers the aiohttp path; for thread-pool batches take a sampling
+profile with `py-spy record -o profile.svg -- python examples/profile_batch.py`.
+"""
+import cProfile
+import importlib.util
+import json
+import os
+import pstats
+import sys
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# production-sdk.py has a hyphenated name, so load it by path
+_SDK_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "production-sdk.py")
+_spec = importlib.util.spec_from_file_location("production_sdk", _SDK_PATH)
+production_sdk = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(production_sdk)
+Config = production_sdk.Config
+DocumentProcessor = production_sdk.DocumentProcessor
+
+
+class StubAPIHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        if self.path.endswith("/process_batch"):
+            body = [{"status": "completed"} for _ in payload["urls"]]
+        else:
+            body = {"status": "completed", "metadata": {"pages": 1}}
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main(num_urls):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubAPIHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    with tempfile.NamedTemporaryFile("w", suffix=".yaml", delete=False) as config_file:
+        config_file.write(f'API_ENDPOINT: "http://127.0.0.1:{server.server_port}"\n')
+        config_file.write('API_KEY: "profiling"\n')
+
+    urls = [f"https://example.com/document{i}.pdf" for i in range(num_urls)]
+    try:
+        with DocumentProcessor(Config(config_file.name)) as processor:
+            profiler = cProfile.Profile()
+            profiler.enable()
+            processor.process_batch(urls, progress_callback=lambda completed, total: None)
+            profiler.disable()
+    finally:
+        os.remove(config_file.name)
+        server.shutdown()
+        server.server_close()
+
+    pstats.Stats(profiler).sort_stats("cumulative").print_stats(25)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000)
@@ -1,6 +1,19 @@
+import os
+import copy
 import json
+from functools import lru_cache
 from feedback_forge_sdk.exceptions import AuthenticationError
 
+try:
+    from orjson import loads as _json_loads
+except ImportError:  # orjson is optional
+    _json_loads = json.loads
+
+@lru_cache(maxsize=8)
+def _load_gcp_key(path, mtime_ns):
+    with open(path, 'rb') as f:
+        return _json_loads(f.read())
+
 class Authenticator:
     def __init__(self, config):
         self.config = config
@@ -8,12 +21,14 @@ class Authenticator:
     def authenticate(self):
         try:
             json_key_path = self.config.get("GCP_JSON_KEY_PATH")
-            if not json_key_path or not os.path.exists(json_key_path):
+            if not json_key_path:
                 raise AuthenticationError(f"GCP JSON key file not found: {json_key_path}")
 
-            with open(json_key_path, 'r') as f:
-                return json.load(f)
+            path = os.path.abspath(json_key_path)
+            return copy.copy(_load_gcp_key(path, os.stat(path).st_mtime_ns))
         except AuthenticationError:
             raise
+        except FileNotFoundError:
+            raise AuthenticationError(f"GCP JSON key file not found: {json_key_path}")
         except Exception as e:
             raise AuthenticationError("Authentication failed", e)
@@ -1,7 +1,19 @@
 import os
+import copy
 import yaml
+from functools import lru_cache
 from feedback_forge_sdk.exceptions import ConfigurationError
 
+try:
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _SafeLoader
+
+@lru_cache(maxsize=32)
+def _load_yaml_cached(path, mtime_ns):
+    with open(path, 'r') as file:
+        return yaml.load(file, Loader=_SafeLoader)
+
 class Config:
     def __init__(self, config_path=None):
         self.config_path = config_path or os.path.join(os.path.dirname(__file__), 'env.yaml')
@@ -10,20 +22,23 @@ class Config:
 
     def _load_config(self):
         try:
-            if os.path.exists(self.config_path):
-                with open(self.config_path, 'r') as file:
-                    return yaml.safe_load(file)
-            return {
-                'API_ENDPOINT': os.getenv('API_ENDPOINT'),
-                'API_KEY': os.getenv('API_KEY'),
-                'GCP_JSON_KEY_PATH': os.getenv('GCP_JSON_KEY_PATH')
-            }
+            path = os.path.abspath(self.config_path)
+            try:
+                mtime_ns = os.stat(path).st_mtime_ns
+            except FileNotFoundError:
+                return {
+                    'API_ENDPOINT': os.getenv('API_ENDPOINT'),
+                    'API_KEY': os.getenv('API_KEY'),
+                    'GCP_JSON_KEY_PATH': os.getenv('GCP_JSON_KEY_PATH')
+                }
+            return copy.copy(_load_yaml_cached(path, mtime_ns))
         except Exception as e:
             raise ConfigurationError("Failed to load configuration", e)
 
     def _validate_config(self):
-        required_fields = ['API_ENDPOINT', 'API_KEY']
-        missing_fields = [field for field in required_fields if not self.config.get(field)]
+        required_fields = {'API_ENDPOINT', 'API_KEY'}
+        present_fields = {key for key, value in self.config.items() if value}
+        missing_fields = sorted(required_fields - present_fields)
         if missing_fields:
             raise ConfigurationError(f"Missing required configuration: {', '.join(missing_fields)}")
 
@@ -1,4 +1,5 @@
 import os
+import sys
 import yaml
 import logging
 import requests
@@ -18,6 +19,10 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Five threads per CPU, capped at 32: the requests are I/O-bound, so most
+# workers sit waiting on the network
+DEFAULT_MAX_WORKERS = min(32, (os.cpu_count() or 1) * 5)
+
 # -----------------------
 # Exceptions
 # -----------------------
@@ -36,7 +41,10 @@ class APIError(SDKException):
 # -----------------------
 # Data Models
 # -----------------------
-@dataclass
+# slots=True needs Python 3.10+; older interpreters keep a __dict__ per instance
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
 class ProcessingResult:
     """Represents the result of document processing."""
     url: str
@@ -99,18 +107,22 @@ class DocumentProcessor:
     def process_batch(
         self,
         urls: List[str],
-        max_workers: int = 5
+        max_workers: Optional[int] = None
     ) -> List[ProcessingResult]:
         """
         Process multiple documents concurrently.
         
         Args:
             urls: List of document URLs to process
-            max_workers: Maximum number of concurrent workers
+            max_workers: Maximum number of concurrent workers; defaults to
+                DEFAULT_MAX_WORKERS
             
         Returns:
             List of ProcessingResult objects
         """
+        if max_workers is None:
+            max_workers = DEFAULT_MAX_WORKERS
+
         results = []
         total = len(urls)
         completed = 0
@@ -1,4 +1,5 @@
 import os
+import sys
 import yaml
 import logging
 import requests
@@ -9,6 +10,11 @@ from datetime import datetime
 from crontab import CronTab
 import json
 
+try:
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _SafeLoader
+
 # -----------------------
 # Logging Configuration
 # -----------------------
@@ -18,6 +24,10 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Five threads per CPU, capped at 32: the requests are I/O-bound, so most
+# workers sit waiting on the network
+DEFAULT_MAX_WORKERS = min(32, (os.cpu_count() or 1) * 5)
+
 # -----------------------
 # Exceptions
 # -----------------------
@@ -50,7 +60,10 @@ class ValidationError(SDKException):
 # -----------------------
 # Data Models
 # -----------------------
-@dataclass
+# slots=True needs Python 3.10+; older interpreters keep a __dict__ per instance
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
 class ProcessingResult:
     """Represents the result of document processing."""
     url: str
@@ -74,7 +87,7 @@ class Config:
         try:
             if os.path.exists(self.config_path):
                 with open(self.config_path, 'r') as file:
-                    return yaml.safe_load(file)
+                    return yaml.load(file, Loader=_SafeLoader)
             
             # Fallback to environment variables
             return {
@@ -148,8 +161,9 @@ class APIClient:
 # -----------------------
 class DocumentProcessor:
     """Handles document processing operations."""
-    def __init__(self, api_client: APIClient):
+    def __init__(self, api_client: APIClient, max_workers: Optional[int] = None):
         self.api_client = api_client
+        self.max_workers = max_workers or DEFAULT_MAX_WORKERS
 
     def process_document(self, url: str) -> ProcessingResult:
         """Process a single document."""
@@ -168,11 +182,13 @@ class DocumentProcessor:
     def process_batch(
         self,
         urls: List[str],
-        max_workers: int = 5
+        max_workers: Optional[int] = None
     ) -> List[ProcessingResult]:
         """Process multiple documents concurrently."""
         if not urls:
             raise ValidationError("No URLs provided for processing")
+        if max_workers is None:
+            max_workers = self.max_workers
 
         results = []
         total = len(urls)
@@ -238,11 +254,15 @@ class DocumentProcessingScheduler:
 # -----------------------
 class DocumentProcessingSDK:
     """Main SDK class that orchestrates all functionality."""
-    def __init__(self, config_path: Optional[str] = None):
+    def __init__(
+        self,
+        config_path: Optional[str] = None,
+        max_parallel_requests: Optional[int] = None
+    ):
         self.config = Config(config_path)
         self.authenticator = Authenticator(self.config)
         self.api_client = APIClient(self.config)
-        self.processor = DocumentProcessor(self.api_client)
+        self.processor = DocumentProcessor(self.api_client, max_parallel_requests)
         
     def authenticate(self) -> str:
         """Authenticate with GCP."""
@@ -251,7 +271,7 @@ class DocumentProcessingSDK:
     def process_documents(
         self,
         urls: List[str],
-        max_workers: int = 5
+        max_workers: Optional[int] = None
     ) -> List[ProcessingResult]:
         """Process multiple documents."""
         return self.processor.process_batch(urls, max_workers)
@@ -1,17 +1,41 @@
 import os
+import ssl
+import sys
+import copy
 import yaml
 import logging
+import asyncio
+import threading
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from queue import Queue
 import time
 from crontab import CronTab
-from typing import List, Dict, Optional, Union, Callable
-from dataclasses import dataclass
+from typing import List, Dict, Iterator, Optional, Union, Callable
+from dataclasses import dataclass, field
 from datetime import datetime
-import backoff
+from functools import lru_cache
 import json
 
+try:
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _SafeLoader
+
+try:
+    from orjson import dumps as _json_dumps, loads as _json_loads
+except ImportError:  # orjson is optional; stdlib json also accepts bytes
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj).encode('utf-8')
+    _json_loads = json.loads
+
+try:
+    import aiohttp
+except ImportError:  # aiohttp is optional; batches fall back to the thread pool
+    aiohttp = None
+
 # -----------------------
 # Logging Configuration
 # -----------------------
@@ -21,6 +45,13 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Five threads per CPU, capped at 32: the requests are I/O-bound, so most
+# workers sit waiting on the network
+DEFAULT_MAX_WORKERS = min(32, (os.cpu_count() or 1) * 5)
+
+# Seconds a single document request may take, on both the requests and aiohttp paths
+REQUEST_TIMEOUT = 30
+
 # -----------------------
 # Exceptions
 # -----------------------
@@ -43,15 +74,24 @@ class APIError(SDKException):
 # -----------------------
 # Data Models
 # -----------------------
-@dataclass
+# slots=True needs Python 3.10+; older interpreters keep a __dict__ per instance
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
 class ProcessingResult:
     """Represents the result of document processing."""
     url: str
     status: str
-    processed_at: datetime
+    # Epoch nanoseconds; the datetime is only built when someone reads it
+    processed_at_ns: int = field(default_factory=time.time_ns)
     metadata: Optional[Dict] = None
     error: Optional[str] = None
 
+    @property
+    def processed_at(self) -> datetime:
+        """Time the result was produced, as a local datetime."""
+        return datetime.fromtimestamp(self.processed_at_ns / 1e9)
+
     def to_dict(self) -> Dict:
         """Convert the result to a dictionary."""
         return {
@@ -65,30 +105,46 @@ class ProcessingResult:
 # -----------------------
 # Configuration
 # -----------------------
+_DEFAULT_CONFIG_PATH = os.path.join(os.path.dirname(__file__), 'env.yaml')
+
+@lru_cache(maxsize=32)
+def _load_yaml_cached(path: str, mtime_ns: int) -> Dict:
+    """Parse a YAML file; the mtime in the cache key invalidates edited files."""
+    with open(path, 'r') as file:
+        return yaml.load(file, Loader=_SafeLoader)
+
 class Config:
     """Configuration manager for the SDK."""
+    __slots__ = ("config_path", "config", "api_endpoint", "api_key")
+
     def __init__(self, config_path: Optional[str] = None):
-        self.config_path = config_path or os.path.join(os.path.dirname(__file__), 'env.yaml')
+        self.config_path = config_path or _DEFAULT_CONFIG_PATH
         self.config = self._load_config()
         self._validate_config()
+        # Hot keys as plain attributes for per-request callers
+        self.api_endpoint = self.config['API_ENDPOINT']
+        self.api_key = self.config['API_KEY']
 
     def _load_config(self) -> Dict:
         """Load configuration from file or environment variables."""
-        if os.path.exists(self.config_path):
-            with open(self.config_path, 'r') as file:
-                return yaml.safe_load(file)
-        
-        # Fallback to environment variables
-        return {
-            'API_ENDPOINT': os.getenv('API_ENDPOINT'),
-            'API_KEY': os.getenv('API_KEY'),
-            'GCP_JSON_KEY_PATH': os.getenv('GCP_JSON_KEY_PATH')
-        }
+        path = os.path.abspath(self.config_path)
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            # Fallback to environment variables
+            return {
+                'API_ENDPOINT': os.getenv('API_ENDPOINT'),
+                'API_KEY': os.getenv('API_KEY'),
+                'GCP_JSON_KEY_PATH': os.getenv('GCP_JSON_KEY_PATH')
+            }
+        # Copy so callers mutating their config don't poison the cache
+        return copy.copy(_load_yaml_cached(path, mtime_ns))
 
     def _validate_config(self):
         """Validate required configuration values."""
-        required_fields = ['API_ENDPOINT', 'API_KEY']
-        missing_fields = [field for field in required_fields if not self.config.get(field)]
+        required_fields = {'API_ENDPOINT', 'API_KEY'}
+        present_fields = {key for key, value in self.config.items() if value}
+        missing_fields = sorted(required_fields - present_fields)
         if missing_fields:
             raise ConfigurationError(f"Missing required configuration: {', '.join(missing_fields)}")
 
@@ -99,6 +155,12 @@ class Config:
 # -----------------------
 # Authentication
 # -----------------------
+@lru_cache(maxsize=8)
+def _load_gcp_key(path: str, mtime_ns: int) -> Dict:
+    """Parse a GCP JSON key file; the mtime in the cache key invalidates edited files."""
+    with open(path, 'rb') as f:
+        return _json_loads(f.read())
+
 class Authenticator:
     """Handles authentication with GCP."""
     def __init__(self, config: Config):
@@ -108,87 +170,364 @@ class Authenticator:
     def authenticate(self) -> str:
         """Authenticate and return credentials."""
         json_key_path = self.config.get("GCP_JSON_KEY_PATH")
-        if not json_key_path or not os.path.exists(json_key_path):
+        if not json_key_path:
             raise AuthenticationError(f"GCP JSON key file not found: {json_key_path}")
         
         try:
             # Placeholder for actual GCP auth logic
-            with open(json_key_path, 'r') as f:
-                self._credentials = json.load(f)
+            path = os.path.abspath(json_key_path)
+            # Copy so mutating these credentials can't change the cached key
+            self._credentials = copy.copy(_load_gcp_key(path, os.stat(path).st_mtime_ns))
             return json_key_path
+        except FileNotFoundError:
+            raise AuthenticationError(f"GCP JSON key file not found: {json_key_path}")
         except Exception as e:
             raise AuthenticationError(f"Authentication failed: {str(e)}")
 
 # -----------------------
 # API Client
 # -----------------------
+def _throttled_progress_logger(interval: float = 1.0) -> Callable[[int, int], None]:
+    """Build a progress callback that logs at most once per interval, plus the final count."""
+    next_log_at = 0.0
+
+    def log_progress(completed: int, total: int):
+        nonlocal next_log_at
+        now = time.monotonic()
+        if completed == total or now >= next_log_at:
+            logger.info("Progress: %d/%d documents processed", completed, total)
+            next_log_at = now + interval
+
+    return log_progress
+
 class DocumentProcessor:
     """Handles document processing API calls."""
-    def __init__(self, config: Config):
+    def __init__(
+        self,
+        config: Config,
+        max_workers: Optional[int] = None,
+        pool_size: Optional[int] = None
+    ):
         self.config = config
-        self.session = requests.Session()
-        self.session.headers.update({
-            "Authorization": f"Bearer {config.get('API_KEY')}",
+        self.max_workers = max_workers or DEFAULT_MAX_WORKERS
+        self._headers = {
+            "Authorization": f"Bearer {config.api_key}",
             "Content-Type": "application/json"
-        })
-
-    @backoff.on_exception(
-        backoff.expo,
-        (requests.exceptions.RequestException, APIError),
-        max_tries=3,
-        max_time=30
-    )
+        }
+        endpoint = config.api_endpoint.rstrip('/')
+        self._process_url = f"{endpoint}/process"
+        self._process_batch_url = f"{endpoint}/process_batch"
+        self.session = requests.Session()
+        self.session.headers.update(self._headers)
+        # Prepared once through the session (headers, auth) so each document
+        # only swaps in its own body. Header values are pre-encoded so
+        # http.client doesn't encode them per send.
+        self._process_template = self.session.prepare_request(
+            requests.Request("POST", self._process_url)
+        )
+        for name, value in list(self._process_template.headers.items()):
+            if isinstance(value, str):
+                self._process_template.headers[name] = value.encode('latin-1')
+        # session.send() skips the environment lookup session.request() does
+        # (REQUESTS_CA_BUNDLE, proxies), so resolve it once here
+        self._send_settings = self.session.merge_environment_settings(
+            self._process_url, {}, None, None, None
+        )
+
+        # requests defaults to 10 pooled connections per host; size the pool
+        # to the worker count so threads reuse keep-alive connections instead
+        # of opening (and TLS-handshaking) new ones when the pool overflows.
+        # Retries with backoff happen inside urllib3's connection pool.
+        pool_size = pool_size or self.max_workers
+        # Also drives the retries on the aiohttp path
+        self._retry = retry = Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist={429, 502, 503, 504},
+            allowed_methods={"POST"},
+            respect_retry_after_header=True
+        )
+        adapter = HTTPAdapter(
+            pool_connections=pool_size,
+            pool_maxsize=pool_size,
+            max_retries=retry
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        # Shared across batches; worker threads are started on demand
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix="doc-proc"
+        )
+
+    def close(self):
+        """Shut down the worker threads and release pooled connections."""
+        self._executor.shutdown(wait=True)
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
     def process_document(self, url: str) -> ProcessingResult:
         """Process a single document."""
         try:
-            response = self.session.post(
-                f"{self.config.get('API_ENDPOINT')}/process",
-                json={"url": url}
-            )
+            request = self._process_template.copy()
+            request.body = _json_dumps({"url": url})
+            request.headers['Content-Length'] = str(len(request.body))
+            if self.session.cookies:
+                # Pick up cookies set since the template was built, e.g. LB stickiness
+                request.prepare_cookies(self.session.cookies)
+            response = self.session.send(request, timeout=REQUEST_TIMEOUT, **self._send_settings)
             response.raise_for_status()
-            data = response.json()
+            data = _json_loads(response.content)
             
             return ProcessingResult(
                 url=url,
                 status=data.get('status', 'completed'),
-                processed_at=datetime.now(),
                 metadata=data.get('metadata')
             )
-        except requests.exceptions.RequestException as e:
+        except (requests.exceptions.RequestException, ValueError) as e:
             logger.error(f"API call failed for URL {url}: {str(e)}")
             return ProcessingResult(
                 url=url,
                 status='failed',
-                processed_at=datetime.now(),
                 error=str(e)
             )
 
-    def process_batch(
+    def process_batch_api(self, urls: List[str], chunk_size: int = 50) -> List[ProcessingResult]:
+        """Process documents through the batch endpoint, one POST per chunk.
+
+        Falls back to per-document requests if the API has no batch endpoint.
+        """
+        results = []
+        for start in range(0, len(urls), chunk_size):
+            chunk = urls[start:start + chunk_size]
+            try:
+                response = self.session.post(
+                    self._process_batch_url,
+                    json={"urls": chunk},
+                    timeout=REQUEST_TIMEOUT
+                )
+                if response.status_code == 404:
+                    logger.warning("Batch endpoint not available, processing documents individually")
+                    return results + self.process_batch(urls[start:])
+                response.raise_for_status()
+                items = _json_loads(response.content)
+                if not isinstance(items, list) or len(items) != len(chunk):
+                    raise APIError(f"Batch response is not a list of {len(chunk)} results")
+                if not all(isinstance(item, dict) for item in items):
+                    raise APIError("Batch response contains non-object results")
+            except (requests.exceptions.RequestException, APIError, ValueError) as e:
+                logger.error(f"Batch API call failed for {len(chunk)} URLs: {str(e)}")
+                results.extend(
+                    ProcessingResult(url=url, status='failed', error=str(e))
+                    for url in chunk
+                )
+                continue
+
+            results.extend(
+                ProcessingResult(
+                    url=url,
+                    status=item.get('status', 'completed'),
+                    metadata=item.get('metadata'),
+                    error=item.get('error')
+                )
+                for url, item in zip(chunk, items)
+            )
+        return results
+
+    async def _process_document_async(self, session, url: str) -> ProcessingResult:
+        """Process a single document on a shared aiohttp session.
+
+        Retries connection errors, timeouts and retryable statuses on the
+        same schedule as the session's urllib3 Retry, honouring Retry-After.
+        """
+        retry = self._retry
+        try:
+            for attempt in range(retry.total + 1):
+                last_attempt = attempt == retry.total
+                delay = retry.backoff_factor * (2 ** attempt)
+                try:
+                    async with session.post(
+                        self._process_url,
+                        json={"url": url}
+                    ) as response:
+                        if last_attempt or response.status not in retry.status_forcelist:
+                            response.raise_for_status()
+                            data = _json_loads(await response.read())
+                            break
+                        retry_after = response.headers.get("Retry-After", "")
+                        if retry_after.isdigit():
+                            delay = float(retry_after)
+                except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                    if last_attempt:
+                        raise
+                await asyncio.sleep(delay)
+
+            return ProcessingResult(
+                url=url,
+                status=data.get('status', 'completed'),
+                metadata=data.get('metadata')
+            )
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+            # asyncio.TimeoutError has an empty str()
+            error = str(e) or repr(e)
+            logger.error(f"API call failed for URL {url}: {error}")
+            return ProcessingResult(
+                url=url,
+                status='failed',
+                error=error
+            )
+
+    async def process_batch_async(
         self,
         urls: List[str],
-        max_workers: int = 5,
+        max_workers: Optional[int] = None,
         progress_callback: Optional[Callable[[int, int], None]] = None
     ) -> List[ProcessingResult]:
-        """Process multiple documents concurrently."""
-        results = []
+        """Process multiple documents concurrently on a single event loop."""
+        if aiohttp is None:
+            raise SDKException("aiohttp is required for asynchronous batch processing")
+        if max_workers is None:
+            max_workers = self.max_workers
+
+        if progress_callback is None:
+            progress_callback = _throttled_progress_logger()
+
         total = len(urls)
         completed = 0
 
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            future_to_url = {executor.submit(self.process_document, url): url for url in urls}
-            
-            for future in as_completed(future_to_url):
-                result = future.result()
-                results.append(result)
-                completed += 1
-                
-                if progress_callback:
-                    progress_callback(completed, total)
-                else:
-                    logger.info(f"Progress: {completed}/{total} documents processed")
+        # Only max_workers requests are started at a time, so the timeouts
+        # below never count time spent waiting for a free connection
+        semaphore = asyncio.Semaphore(max_workers)
+
+        async def track(session, url: str) -> ProcessingResult:
+            nonlocal completed
+            async with semaphore:
+                result = await self._process_document_async(session, url)
+            completed += 1
+            progress_callback(completed, total)
+            return result
+
+        # Verify TLS the way the requests session does (REQUESTS_CA_BUNDLE etc.)
+        verify = self._send_settings.get('verify', True)
+        if isinstance(verify, str):
+            if os.path.isdir(verify):
+                verify = ssl.create_default_context(capath=verify)
+            else:
+                verify = ssl.create_default_context(cafile=verify)
+        connector = aiohttp.TCPConnector(
+            limit=max_workers,
+            limit_per_host=max_workers,
+            keepalive_timeout=75,
+            ssl=verify
+        )
+        # Per connect and per read, like the timeout on the requests path
+        timeout = aiohttp.ClientTimeout(
+            total=None,
+            sock_connect=REQUEST_TIMEOUT,
+            sock_read=REQUEST_TIMEOUT
+        )
+        # trust_env picks up the same proxy settings as requests
+        async with aiohttp.ClientSession(
+            connector=connector,
+            headers=self._headers,
+            timeout=timeout,
+            trust_env=True
+        ) as session:
+            outcomes = await asyncio.gather(
+                *(track(session, url) for url in urls),
+                return_exceptions=True
+            )
 
+        results = []
+        for url, outcome in zip(urls, outcomes):
+            if isinstance(outcome, Exception):
+                error = str(outcome) or repr(outcome)
+                logger.error(f"API call failed for URL {url}: {error}")
+                outcome = ProcessingResult(
+                    url=url,
+                    status='failed',
+                    error=error
+                )
+            results.append(outcome)
         return results
 
+    def process_batch(
+        self,
+        urls: List[str],
+        max_workers: Optional[int] = None,
+        progress_callback: Optional[Callable[[int, int], None]] = None
+    ) -> List[ProcessingResult]:
+        """Process multiple documents concurrently.
+
+        Uses a single aiohttp event loop when aiohttp is installed, and a
+        thread pool otherwise or when called from inside a running loop.
+        Each distinct URL is requested once; results are returned in the
+        order of ``urls``, with duplicates sharing a result.
+        """
+        if not urls:
+            return []
+        if max_workers is None:
+            max_workers = self.max_workers
+
+        unique_urls = list(dict.fromkeys(urls))
+        results = None
+        if aiohttp is not None:
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                results = asyncio.run(
+                    self.process_batch_async(unique_urls, max_workers, progress_callback)
+                )
+        if results is None:
+            results = self.iter_process_batch(unique_urls, max_workers, progress_callback)
+
+        results_by_url = {result.url: result for result in results}
+        return [results_by_url[url] for url in urls]
+
+    def iter_process_batch(
+        self,
+        urls: List[str],
+        max_workers: Optional[int] = None,
+        progress_callback: Optional[Callable[[int, int], None]] = None
+    ) -> Iterator[ProcessingResult]:
+        """Process documents on a thread pool, yielding results as they complete.
+
+        Every URL is submitted up front, but each result is released once
+        yielded, so memory held for results stays constant however large
+        the batch.
+        """
+        if max_workers is None or max_workers == self.max_workers:
+            yield from self._iter_completed(self._executor, urls, progress_callback)
+        else:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                yield from self._iter_completed(executor, urls, progress_callback)
+
+    def _iter_completed(
+        self,
+        executor: ThreadPoolExecutor,
+        urls: List[str],
+        progress_callback: Optional[Callable[[int, int], None]]
+    ) -> Iterator[ProcessingResult]:
+        """Submit every URL to the executor and yield results in completion order."""
+        if progress_callback is None:
+            progress_callback = _throttled_progress_logger()
+
+        total = len(urls)
+        completed = 0
+
+        # Unnamed so as_completed holds the only reference to each future and
+        # drops it once yielded; a list here would keep every result alive
+        for future in as_completed(executor.submit(self.process_document, url) for url in urls):
+            completed += 1
+            progress_callback(completed, total)
+            yield future.result()
+
 # -----------------------
 # Scheduler
 # -----------------------
@@ -221,10 +560,14 @@ class DocumentProcessingScheduler:
 # -----------------------
 class DocumentProcessingSDK:
     """Main SDK class that orchestrates all functionality."""
-    def __init__(self, config_path: Optional[str] = None):
+    def __init__(
+        self,
+        config_path: Optional[str] = None,
+        max_parallel_requests: Optional[int] = None
+    ):
         self.config = Config(config_path)
         self.authenticator = Authenticator(self.config)
-        self.processor = DocumentProcessor(self.config)
+        self.processor = DocumentProcessor(self.config, max_parallel_requests)
         
     def authenticate(self) -> str:
         """Authenticate with GCP."""
@@ -233,7 +576,7 @@ class DocumentProcessingSDK:
     def process_documents(
         self,
         urls: List[str],
-        max_workers: int = 5,
+        max_workers: Optional[int] = None,
         progress_callback: Optional[Callable[[int, int], None]] = None
     ) -> List[ProcessingResult]:
         """Process multiple documents."""
@@ -249,6 +592,24 @@ class DocumentProcessingSDK:
         scheduler = DocumentProcessingScheduler(script_path)
         return scheduler.schedule_job(schedule, comment)
 
+_SDK_INSTANCES: Dict[str, DocumentProcessingSDK] = {}
+_SDK_INSTANCES_LOCK = threading.Lock()
+
+def get_sdk(config_path: Optional[str] = None) -> DocumentProcessingSDK:
+    """Return the process-wide SDK instance for a config file, building it on first use.
+
+    Reusing the instance keeps the parsed config, credentials and the
+    HTTP connection pool warm across calls within one process. Paths are
+    normalised, so different spellings of one file share an instance.
+    Instances are never evicted, so none is dropped with its pool open.
+    """
+    path = os.path.abspath(config_path or _DEFAULT_CONFIG_PATH)
+    with _SDK_INSTANCES_LOCK:
+        sdk = _SDK_INSTANCES.get(path)
+        if sdk is None:
+            sdk = _SDK_INSTANCES[path] = DocumentProcessingSDK(path)
+        return sdk
+
 # -----------------------
 # Example Usage
 # -----------------------
@@ -258,7 +619,7 @@ if __name__ == "__main__":
 
     try:
         # Initialize SDK
-        sdk = DocumentProcessingSDK()
+        sdk = get_sdk()
         
         # Authenticate
         creds = sdk.authenticate()
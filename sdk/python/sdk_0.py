@@ -1,12 +1,43 @@
 import os
+import atexit
+import json
+import random
+import re
+import statistics
 import yaml
 import logging
+import asyncio
+import threading
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from functools import lru_cache
+from array import array
+from collections import Counter
 from concurrent.futures import ThreadPoolExecutor
+from queue import Queue, SimpleQueue
 import time
 from crontab import CronTab
-from typing import List
+from typing import List, Optional
 import unittest
+from unittest import mock
+
+try:
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _SafeLoader
+
+try:
+    from orjson import dumps as _json_dumps, loads as _json_loads
+except ImportError:  # orjson is optional; stdlib json also accepts bytes
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj).encode('utf-8')
+    _json_loads = json.loads
+
+try:
+    import aiohttp
+except ImportError:  # aiohttp is optional; batches fall back to threads
+    aiohttp = None
 
 # -----------------------
 # Logging Configuration
@@ -17,20 +48,50 @@ logger = logging.getLogger(__name__)
 # -----------------------
 # config.py
 # -----------------------
+_MODULE_DIR = os.path.dirname(os.path.abspath(__file__))
+_CONFIG_PATH = os.path.join(_MODULE_DIR, 'env.yaml')
+
+@lru_cache(maxsize=1)
 def load_config():
-    """Load configuration from env.yaml."""
-    config_path = os.path.join(os.path.dirname(__file__), 'env.yaml')
-    with open(config_path, 'r') as file:
-        return yaml.safe_load(file)
+    """Load configuration from env.yaml (parsed once per process)."""
+    with open(_CONFIG_PATH, 'rb') as file:
+        return yaml.load(file, Loader=_SafeLoader)
+
+# An empty env.yaml parses to None; treat it as "no settings"
+config = load_config() or {}
 
-config = load_config()
+# Hot settings, read once instead of on every request
+API_ENDPOINT = config.get("API_ENDPOINT")
+API_KEY = config.get("API_KEY")
+GCP_JSON_KEY_PATH = config.get("GCP_JSON_KEY_PATH")
+
+def _positive_int_setting(name: str, default: int) -> int:
+    """Read an integer setting; env.yaml wins over the environment."""
+    value = config.get(name)
+    if value is None:
+        value = os.getenv(name) or default
+    value = int(value)
+    if value < 1:
+        raise ValueError(f"{name} must be at least 1, got {value}")
+    return value
+
+# Worker threads for process_documents
+MAX_CONCURRENCY = _positive_int_setting("MAX_CONCURRENCY", 16)
+
+# URLs per /process_batch request; 1 keeps one /process request per URL
+BATCH_SIZE = _positive_int_setting("BATCH_SIZE", 1)
 
 # -----------------------
 # auth.py
 # -----------------------
+@lru_cache(maxsize=1)
 def authenticate():
-    """Authenticate using GCP JSON key and return necessary credentials."""
-    json_key_path = config.get("GCP_JSON_KEY_PATH")
+    """Authenticate using GCP JSON key and return necessary credentials.
+
+    The key file is checked once; later calls return the cached result.
+    Failures aren't cached, so a missing key is re-checked on every call.
+    """
+    json_key_path = GCP_JSON_KEY_PATH
     if not os.path.exists(json_key_path):
         raise FileNotFoundError(f"GCP JSON key file not found: {json_key_path}")
     return json_key_path  # Placeholder for actual GCP auth logic
@@ -38,64 +99,437 @@ def authenticate():
 # -----------------------
 # utils.py
 # -----------------------
-def retry(func, retries=3, delay=2):
-    """Retry a function call with exponential backoff."""
-    for attempt in range(retries):
+# Request latencies in ns keyed by HTTP status ("error" when no response).
+# array.append is a single GIL-held operation, so recording takes no lock.
+# Each key keeps at most _MAX_LATENCY_SAMPLES recent samples; the older half
+# is dropped whenever that fills up.
+_MAX_LATENCY_SAMPLES = 10_000
+_LATENCIES_NS = {}
+_COUNTERS = Counter()
+_COUNTERS_LOCK = threading.Lock()
+
+def _record_latency(key, started_ns: int):
+    elapsed = time.perf_counter_ns() - started_ns
+    try:
+        samples = _LATENCIES_NS[key]
+    except KeyError:
+        samples = _LATENCIES_NS.setdefault(key, array('q'))
+    samples.append(elapsed)
+    if len(samples) >= _MAX_LATENCY_SAMPLES:
+        del samples[:_MAX_LATENCY_SAMPLES // 2]
+
+def _count(name: str, amount: int = 1):
+    with _COUNTERS_LOCK:
+        _COUNTERS[name] += amount
+
+def get_metrics(reset: bool = False):
+    """Summarise request latencies (ms) per status and retry counts so far.
+
+    With reset=True the samples and counters start over afterwards, so each
+    call reports only what happened since the previous reset.
+    """
+    global _LATENCIES_NS
+    latencies = _LATENCIES_NS
+    if reset:
+        _LATENCIES_NS = {}
+    latency_ms = {}
+    for key, samples in list(latencies.items()):
+        values = [ns / 1e6 for ns in samples]
+        if len(values) > 1:
+            cuts = statistics.quantiles(values, n=100)
+            p50, p95, p99 = cuts[49], cuts[94], cuts[98]
+        else:
+            p50 = p95 = p99 = values[0]
+        latency_ms[key] = {"count": len(values), "p50": p50, "p95": p95, "p99": p99}
+    with _COUNTERS_LOCK:
+        counters = dict(_COUNTERS)
+        if reset:
+            _COUNTERS.clear()
+    return {"latency_ms": latency_ms, **counters}
+
+_BACKOFF_STEPS = (1, 2, 4, 8, 16)
+
+def retry(func, retries=3, delay=2, exceptions=(requests.RequestException, TimeoutError)):
+    """Retry a function call with jittered exponential backoff.
+
+    Only `exceptions` are retried; anything else propagates immediately.
+    The last failure is re-raised as-is once `retries` attempts are spent.
+    HTTP calls should rely on the session's adapter-level retries instead.
+    """
+    try:
+        return func()
+    except exceptions as e:
+        last = e
+    for attempt in range(1, retries):
+        _count("retry_failures")
+        if logger.isEnabledFor(logging.WARNING):
+            logger.warning("Attempt %d failed: %s", attempt, last)
+        # Jitter keeps a pool of workers from retrying in lockstep
+        step = _BACKOFF_STEPS[min(attempt, len(_BACKOFF_STEPS)) - 1]
+        time.sleep(delay * step * (0.5 + random.random()))
         try:
             return func()
-        except Exception as e:
-            logger.warning(f"Attempt {attempt + 1} failed: {e}")
-            time.sleep(delay * (2 ** attempt))
-    raise Exception(f"All {retries} retries failed.")
+        except exceptions as e:
+            last = e
+    _count("retry_failures")
+    raise last
 
-def monitor_progress(urls: List[str], completed):
-    """Log progress of document processing."""
+def monitor_progress(urls: List[str], completed: Queue):
+    """Log progress as workers report finished documents on `completed`."""
     total = len(urls)
-    while completed.qsize() < total:
-        logger.info(f"Progress: {completed.qsize()}/{total} documents processed.")
-        time.sleep(1)
+    done = 0
+    while done < total:
+        completed.get()
+        done += 1
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Progress: %d/%d documents processed.", done, total)
 
 # -----------------------
 # sdk.py
 # -----------------------
+# One keep-alive connection pool shared by every worker thread
+_SESSION = requests.Session()
+# Retry connection errors and 5xx (never 4xx) inside urllib3, with jitter.
+# The aiohttp path follows the same schedule.
+_BACKOFF_JITTER = 0.3
+_RETRY = Retry(
+    total=3,
+    backoff_factor=0.5,
+    backoff_jitter=_BACKOFF_JITTER,
+    status_forcelist=(500, 502, 503, 504),
+    allowed_methods=frozenset(["POST"]),
+    respect_retry_after_header=True
+)
+# One pooled connection per worker; pool_block makes a worker wait for a free
+# connection instead of opening a throwaway one when the pool is exhausted
+_ADAPTER = HTTPAdapter(
+    pool_connections=MAX_CONCURRENCY,
+    pool_maxsize=MAX_CONCURRENCY,
+    pool_block=True,
+    max_retries=_RETRY
+)
+_SESSION.mount("https://", _ADAPTER)
+_SESSION.mount("http://", _ADAPTER)
+
+# (connect, read) seconds; caps how long a stuck backend can hold a worker
+_REQUEST_TIMEOUT = (
+    float(config.get("CONNECT_TIMEOUT") or 3.05),
+    float(config.get("READ_TIMEOUT") or 30)
+)
+
+class _ProcessClient:
+    """Everything call_process needs that doesn't change between URLs."""
+    __slots__ = ('url', 'batch_url', 'headers', 'session')
+
+    def __init__(self, endpoint: str, api_key: str, session: requests.Session):
+        self.url = f"{endpoint}/process"
+        self.batch_url = f"{endpoint}/process_batch"
+        self.headers = {
+            "Authorization": f"Bearer {api_key}",
+            "Content-Type": "application/json"
+        }
+        self.session = session
+
+@lru_cache(maxsize=1)
+def _process_client() -> _ProcessClient:
+    """Build the shared /process client on first use."""
+    if not API_ENDPOINT:
+        raise ValueError("API endpoint is not configured.")
+    return _ProcessClient(API_ENDPOINT, API_KEY, _SESSION)
+
+def _timed_post(client: _ProcessClient, url: str, body: bytes):
+    """POST on the shared session, recording latency and adapter retries."""
+    started = time.perf_counter_ns()
+    try:
+        response = client.session.post(
+            url, data=body, headers=client.headers, timeout=_REQUEST_TIMEOUT
+        )
+    except requests.RequestException:
+        _record_latency("error", started)
+        raise
+    _record_latency(response.status_code, started)
+    retries = getattr(getattr(response.raw, "retries", None), "history", ())
+    if retries:
+        _count("http_retries", len(retries))
+    return response
+
 def call_process(url: str):
     """Call the /process endpoint with a document URL."""
-    endpoint = config.get("API_ENDPOINT")
-    if not endpoint:
-        raise ValueError("API endpoint is not configured.")
+    client = _process_client()
+    response = _timed_post(client, client.url, _json_dumps({"url": url}))
+    response.raise_for_status()
+    return _json_loads(response.content)
 
-    headers = {"Authorization": f"Bearer {config.get('API_KEY')}"}
-    payload = {"url": url}
+def call_process_batch(batch: List[str]):
+    """Call the /process_batch endpoint with several document URLs at once."""
+    client = _process_client()
+    response = _timed_post(client, client.batch_url, _json_dumps({"urls": batch}))
+    response.raise_for_status()
+    results = _json_loads(response.content)
+    # Callers pair results with URLs by position, so anything else is unusable
+    if not isinstance(results, list) or len(results) != len(batch):
+        raise ValueError(f"Batch response does not match the {len(batch)} URLs sent")
+    return results
 
-    def make_request():
-        response = requests.post(f"{endpoint}/process", json=payload, headers=headers)
-        response.raise_for_status()
-        return response.json()
+def _batch(urls: List[str], size: int):
+    """Yield consecutive slices of `urls` with at most `size` items."""
+    for i in range(0, len(urls), size):
+        yield urls[i:i + size]
 
-    return retry(make_request)
+def _call_process_isolated(url: str, progress: Optional[Queue] = None):
+    """Call call_process, turning a failure into an error entry for `url`."""
+    try:
+        return call_process(url)
+    except Exception as e:
+        logger.error("Failed to process document: %s", e)
+        return {"error": str(e), "url": url}
+    finally:
+        if progress is not None:
+            progress.put(url)
 
-def process_documents(urls: List[str]):
-    """Process multiple document URLs using the /process endpoint."""
-    results = []
-    with ThreadPoolExecutor() as executor:
-        futures = [executor.submit(call_process, url) for url in urls]
-        for future in futures:
+def _call_process_batch_isolated(batch: List[str], progress: Optional[Queue] = None):
+    """Call call_process_batch, turning a failure into an error entry per URL."""
+    try:
+        return call_process_batch(batch)
+    except Exception as e:
+        logger.error("Failed to process %d documents: %s", len(batch), e)
+        return [{"error": str(e), "url": url} for url in batch]
+    finally:
+        if progress is not None:
+            for url in batch:
+                progress.put(url)
+
+async def _call_process_async(session, url: str, progress: Optional[Queue] = None):
+    """Call the /process endpoint with a document URL on an aiohttp session.
+
+    Connection errors, timeouts and _RETRY's status codes are retried up to
+    _RETRY.total times with jittered backoff, like the requests adapter.
+    """
+    try:
+        client = _process_client()
+        body = _json_dumps({"url": url})
+        for attempt in range(_RETRY.total + 1):
+            last_attempt = attempt == _RETRY.total
+            started = time.perf_counter_ns()
             try:
-                results.append(future.result())
-            except Exception as e:
-                logger.error(f"Failed to process document: {e}")
+                async with session.post(client.url, data=body, headers=client.headers) as response:
+                    _record_latency(response.status, started)
+                    if last_attempt or response.status not in _RETRY.status_forcelist:
+                        response.raise_for_status()
+                        return _json_loads(await response.read())
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                _record_latency("error", started)
+                if last_attempt:
+                    raise
+            _count("http_retries")
+            await asyncio.sleep(
+                _RETRY.backoff_factor * (2 ** attempt) + random.uniform(0, _BACKOFF_JITTER)
+            )
+    finally:
+        if progress is not None:
+            progress.put(url)
+
+async def process_documents_async(urls: List[str], progress: Optional[Queue] = None):
+    """Process multiple document URLs concurrently on the running event loop."""
+    # Keep at most MAX_CONCURRENCY requests in flight so the backend isn't flooded
+    semaphore = asyncio.Semaphore(MAX_CONCURRENCY)
+
+    async def bounded_call(session, url):
+        async with semaphore:
+            return await _call_process_async(session, url, progress)
+
+    # Sized like the requests adapter so MAX_CONCURRENCY isn't silently capped
+    connector = aiohttp.TCPConnector(limit=MAX_CONCURRENCY, limit_per_host=MAX_CONCURRENCY)
+    timeout = aiohttp.ClientTimeout(sock_connect=_REQUEST_TIMEOUT[0], sock_read=_REQUEST_TIMEOUT[1])
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        outcomes = await asyncio.gather(
+            *(bounded_call(session, url) for url in urls),
+            return_exceptions=True
+        )
+
+    results = [None] * len(urls)
+    for index, outcome in enumerate(outcomes):
+        if isinstance(outcome, Exception):
+            logger.error("Failed to process document: %s", outcome)
+            outcome = {"error": str(outcome), "url": urls[index]}
+        results[index] = outcome
     return results
 
+def process_documents(urls: List[str], progress: Optional[Queue] = None):
+    """Process multiple document URLs using the /process endpoint.
+
+    With BATCH_SIZE > 1, URLs are sent to /process_batch in chunks on worker
+    threads. Otherwise each URL gets its own request, on a single aiohttp
+    event loop when aiohttp is installed, and on worker threads when it
+    isn't or when called from inside a running loop. If `progress` is
+    given, each URL is put on it once its request finishes, successfully
+    or not.
+
+    Results line up with `urls`, so `zip(urls, results)` pairs them; a URL
+    that failed gets {"error": ..., "url": ...} in its slot. A URL listed
+    more than once is requested once and its result shared.
+    """
+    if not urls:
+        return []
+
+    unique = list(dict.fromkeys(urls))
+    if len(unique) == len(urls):
+        return _dispatch(urls, progress)
+
+    if progress is not None:
+        progress = _RepeatedProgress(progress, Counter(urls))
+    result_map = dict(zip(unique, _dispatch(unique, progress)))
+    return [result_map[url] for url in urls]
+
+class _RepeatedProgress:
+    """Report a deduplicated URL once per time it appeared in the input."""
+    __slots__ = ('queue', 'counts')
+
+    def __init__(self, queue: Queue, counts: Counter):
+        self.queue = queue
+        self.counts = counts
+
+    def put(self, url: str):
+        for _ in range(self.counts[url]):
+            self.queue.put(url)
+
+def _dispatch(urls: List[str], progress: Optional[Queue] = None):
+    """Send distinct `urls` down whichever request path process_documents picks."""
+    if BATCH_SIZE > 1:
+        chunk_results = _run_on_workers(
+            lambda batch: _call_process_batch_isolated(batch, progress),
+            list(_batch(urls, BATCH_SIZE))
+        )
+        return [result for chunk in chunk_results for result in chunk]
+
+    # Nothing would run in parallel, so skip the event loop setup
+    inline = len(urls) == 1 or MAX_CONCURRENCY == 1
+    if aiohttp is not None and not inline:
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(process_documents_async(urls, progress))
+
+    return _run_on_workers(lambda url: _call_process_isolated(url, progress), urls)
+
+class _WorkBatch:
+    """Output slots and completion tracking for one _run_on_workers call."""
+    __slots__ = ('func', 'outputs', 'remaining', 'lock', 'done', 'window')
+
+    def __init__(self, func, size: int):
+        self.func = func
+        self.outputs = [None] * size
+        self.remaining = size
+        self.lock = threading.Lock()
+        self.done = threading.Event()
+        # Caps how many of this call's items sit in the shared queue at once
+        self.window = threading.BoundedSemaphore(MAX_CONCURRENCY * 2)
+
+    def finish_one(self):
+        self.window.release()
+        with self.lock:
+            self.remaining -= 1
+            if self.remaining == 0:
+                self.done.set()
+
+def _worker():
+    """Long-lived worker: run queued items and record their outputs."""
+    while True:
+        item = _WORK_QUEUE.get()
+        if item is None:
+            return
+        batch, index, value = item
+        try:
+            batch.outputs[index] = batch.func(value)
+        except Exception as e:
+            logger.error("Worker task failed: %s", e)
+        finally:
+            batch.finish_one()
+
+# Started on first use and shared by every later process_documents call.
+# SimpleQueue is C-implemented and, unlike executor futures, allocates
+# nothing per task.
+_WORK_QUEUE = SimpleQueue()
+_WORKERS = []
+_WORKERS_LOCK = threading.Lock()
+
+def _ensure_workers():
+    """Start the shared worker threads once, however many callers race here."""
+    if not _WORKERS:
+        with _WORKERS_LOCK:
+            if not _WORKERS:
+                threads = [
+                    threading.Thread(target=_worker, name=f"ff-sdk-{i}", daemon=True)
+                    for i in range(MAX_CONCURRENCY)
+                ]
+                for thread in threads:
+                    thread.start()
+                atexit.register(_stop_workers)
+                # Publish only once every thread is running
+                _WORKERS.extend(threads)
+
+def _stop_workers():
+    """Let each worker exit after the work already queued ahead of it."""
+    for _ in _WORKERS:
+        _WORK_QUEUE.put(None)
+
+def _run_on_workers(func, items: list) -> list:
+    """Apply `func` to every item on the shared worker threads.
+
+    Each call keeps at most 2 * MAX_CONCURRENCY items queued, so pending
+    work stays proportional to the concurrency rather than to len(items).
+    Outputs are returned in the order of `items`.
+    """
+    if len(items) <= 1 or MAX_CONCURRENCY == 1:
+        # Handing off to a worker only adds a context switch here
+        return [func(value) for value in items]
+
+    _ensure_workers()
+    batch = _WorkBatch(func, len(items))
+    for index, value in enumerate(items):
+        batch.window.acquire()
+        _WORK_QUEUE.put((batch, index, value))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Queue depth: %d", _WORK_QUEUE.qsize())
+    batch.done.wait()
+    return batch.outputs
+
 # -----------------------
 # cron.py
 # -----------------------
+# Jobs installed by this process are remembered so repeat calls don't
+# re-parse the crontab. Otherwise the crontab is re-read each time, so
+# entries added elsewhere aren't overwritten, and a job already there (e.g.
+# from a previous cron run of this script) is reused instead of duplicated.
+_CRON_CACHE = {}
+# Five fields of digits/names with * , - / operators, or one of the @ macros.
+_CRON_FIELD = r"[\w*]+(?:-\w+)?(?:/\d+)?(?:,[\w*]+(?:-\w+)?(?:/\d+)?)*"
+_CRON_RE = re.compile(
+    rf"(?:{_CRON_FIELD} ){{4}}{_CRON_FIELD}"
+    r"|@(?:reboot|yearly|annually|monthly|weekly|daily|midnight|hourly)"
+)
+
 def create_cron_job(script_path: str, schedule: str = "0 18 * * *"):
     """Create a cron job to run the script at the specified schedule."""
+    schedule = " ".join(schedule.split())
+    if not _CRON_RE.fullmatch(schedule):
+        raise ValueError(f"Invalid cron schedule: {schedule!r}")
+    key = (script_path, schedule)
+    if key in _CRON_CACHE:
+        return _CRON_CACHE[key]
+
+    command = f"python {script_path}"
     cron = CronTab(user=True)
-    job = cron.new(command=f"python {script_path}", comment="Process Documents Cron Job")
-    job.setall(schedule)
-    cron.write()
-    logger.info(f"Cron job created: {job}")
+    for job in cron.find_command(command):
+        if job.command == command and str(job.slices) == schedule:
+            break
+    else:
+        job = cron.new(command=command, comment="Process Documents Cron Job")
+        job.setall(schedule)
+        cron.write()
+        logger.info(f"Cron job created: {job}")
+    _CRON_CACHE[key] = job
+    return job
 
 # -----------------------
 # Unit Tests (tests/test_sdk.py)
@@ -114,8 +548,12 @@ class TestSDK(unittest.TestCase):
     def test_retry_failure(self):
         def mock_func():
             raise ValueError("Failure")
-        with self.assertRaises(Exception):
-            retry(mock_func, retries=2)
+        with self.assertRaises(ValueError):
+            retry(mock_func, retries=2, exceptions=(ValueError,), delay=0)
+
+    def test_create_cron_job_invalid_schedule(self):
+        with self.assertRaises(ValueError):
+            create_cron_job(script_path=__file__, schedule="every day at 6")
 
     def test_call_process_invalid_url(self):
         with self.assertRaises(Exception):
@@ -124,13 +562,68 @@ class TestSDK(unittest.TestCase):
     def test_process_documents(self):
         def mock_call_process(url):
             return {"url": url, "status": "processed"}
-        global call_process
+        async def mock_call_process_async(session, url, progress=None):
+            return mock_call_process(url)
+        global call_process, _call_process_async
         original_call_process = call_process
+        original_call_process_async = _call_process_async
         call_process = mock_call_process
+        _call_process_async = mock_call_process_async
         urls = ["https://example.com/doc1", "https://example.com/doc2"]
         results = process_documents(urls)
         self.assertEqual(len(results), len(urls))
         call_process = original_call_process
+        _call_process_async = original_call_process_async
+
+    def test_process_documents_requests_duplicates_once(self):
+        calls = []
+        def mock_call_process(url):
+            calls.append(url)
+            return {"url": url, "status": "processed"}
+        urls = ["a", "b", "a", "c", "a"]
+        progress = Queue()
+        with mock.patch.dict(globals(), {"call_process": mock_call_process, "aiohttp": None}):
+            results = process_documents(urls, progress=progress)
+        self.assertEqual(sorted(calls), ["a", "b", "c"])
+        self.assertEqual([result["url"] for result in results], urls)
+        self.assertEqual(progress.qsize(), len(urls))
+
+    def test_process_documents_failed_url_keeps_slot(self):
+        def mock_call_process(url):
+            if url == "bad":
+                raise ValueError("boom")
+            return {"url": url, "status": "processed"}
+        with mock.patch.dict(globals(), {"call_process": mock_call_process, "aiohttp": None}):
+            results = process_documents(["a", "bad", "c"])
+        self.assertEqual(results[0]["url"], "a")
+        self.assertEqual(results[1], {"error": "boom", "url": "bad"})
+        self.assertEqual(results[2]["url"], "c")
+
+    def test_process_documents_batches_in_order(self):
+        def mock_call_process_batch(batch):
+            if "bad" in batch:
+                raise ValueError("boom")
+            return [{"url": url, "status": "processed"} for url in batch]
+        urls = ["a", "b", "c", "bad", "e"]
+        with mock.patch.dict(globals(), {"call_process_batch": mock_call_process_batch, "BATCH_SIZE": 2}):
+            results = process_documents(urls)
+        self.assertEqual([result["url"] for result in results], urls)
+        self.assertEqual([result.get("error") for result in results], [None, None, "boom", "boom", None])
+
+    def test_call_process_batch_rejects_short_response(self):
+        response = mock.Mock(content=b'[{"status": "processed"}]')
+        client = mock.Mock(batch_url="https://example.com/process_batch")
+        with mock.patch.dict(globals(), {"_timed_post": lambda *args: response, "_process_client": lambda: client}):
+            with self.assertRaises(ValueError):
+                call_process_batch(["a", "b"])
+
+    def test_get_metrics(self):
+        _record_latency("test", time.perf_counter_ns())
+        _record_latency("test", time.perf_counter_ns())
+        latency = get_metrics(reset=True)["latency_ms"]["test"]
+        self.assertEqual(latency["count"], 2)
+        self.assertLessEqual(latency["p50"], latency["p99"])
+        self.assertNotIn("test", get_metrics()["latency_ms"])
 
 if __name__ == "__main__":
     unittest.main()
@@ -139,8 +632,6 @@ if __name__ == "__main__":
 # Example Usage (examples/process_documents.py)
 # -----------------------
 if __name__ == "__main__":
-    from queue import Queue
-
     test_urls = [
         "https://example.com/document1.pdf",
         "https://example.com/document2.pdf"
@@ -153,13 +644,11 @@ if __name__ == "__main__":
         completed = Queue()
         monitor_thread = ThreadPoolExecutor().submit(monitor_progress, test_urls, completed)
 
-        results = process_documents(test_urls)
-        for _ in test_urls:
-            completed.put(1)
-
+        results = process_documents(test_urls, progress=completed)
         monitor_thread.result()  # Wait for monitoring to complete
 
         logger.info(f"Processing results: {results}")
+        logger.info(f"Request metrics: {get_metrics()}")
 
         create_cron_job(script_path=__file__)
 
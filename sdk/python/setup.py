@@ -13,8 +13,13 @@ setup(
     install_requires=[
         "pyyaml",
         "requests",
-        "python-crontab"
+        "python-crontab",
+        "urllib3>=2"
     ],
+    extras_require={
+        "async": ["aiohttp"],
+        "speedups": ["orjson"]
+    },
     classifiers=[
         "Programming Language :: Python :: 3",
         "License :: OSI Approved :: MIT License",
@@ -0,0 +1,169 @@
+import importlib.util
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+# production-sdk.py has a hyphenated name, so it can't be imported normally
+_SDK_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "production-sdk.py")
+_spec = importlib.util.spec_from_file_location("production_sdk", _SDK_PATH)
+production_sdk = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(production_sdk)
+
+
+class TestConfig(unittest.TestCase):
+    def setUp(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".yaml", delete=False) as config_file:
+            config_file.write('API_ENDPOINT: "https://api.example.com"\n')
+            config_file.write('API_KEY: "test-key"\n')
+        self.config_path = config_file.name
+        self.addCleanup(os.remove, self.config_path)
+
+    def test_cached_config_is_not_shared(self):
+        first = production_sdk.Config(self.config_path)
+        first.config["API_KEY"] = "mutated"
+        second = production_sdk.Config(self.config_path)
+        self.assertEqual(second.get("API_KEY"), "test-key")
+
+    def test_edited_config_is_reparsed(self):
+        self.assertEqual(production_sdk.Config(self.config_path).api_key, "test-key")
+        with open(self.config_path, "w") as config_file:
+            config_file.write('API_ENDPOINT: "https://api.example.com"\n')
+            config_file.write('API_KEY: "rotated-key"\n')
+        # Force a new mtime even on filesystems with coarse timestamps
+        mtime_ns = os.stat(self.config_path).st_mtime_ns + 1_000_000_000
+        os.utime(self.config_path, ns=(mtime_ns, mtime_ns))
+        self.assertEqual(production_sdk.Config(self.config_path).api_key, "rotated-key")
+
+    def test_get_sdk_normalises_config_path(self):
+        self.addCleanup(production_sdk._SDK_INSTANCES.clear)
+        sdk = production_sdk.get_sdk(self.config_path)
+        self.addCleanup(sdk.processor.close)
+        self.assertIs(production_sdk.get_sdk(os.path.relpath(self.config_path)), sdk)
+
+
+class TestAuthenticator(unittest.TestCase):
+    def test_credentials_are_not_shared(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as key_file:
+            key_file.write('{"client_email": "sdk@example.com"}')
+        self.addCleanup(os.remove, key_file.name)
+        config = mock.Mock(get=lambda key: key_file.name)
+
+        first = production_sdk.Authenticator(config)
+        first.authenticate()
+        first._credentials["client_email"] = "mutated"
+        second = production_sdk.Authenticator(config)
+        second.authenticate()
+        self.assertEqual(second._credentials["client_email"], "sdk@example.com")
+
+
+class TestDocumentProcessor(unittest.TestCase):
+    def setUp(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".yaml", delete=False) as config_file:
+            config_file.write('API_ENDPOINT: "https://api.example.com"\n')
+            config_file.write('API_KEY: "test-key"\n')
+        self.addCleanup(os.remove, config_file.name)
+        self.processor = production_sdk.DocumentProcessor(production_sdk.Config(config_file.name))
+        self.addCleanup(self.processor.close)
+
+    def test_process_batch_dedupes_in_input_order(self):
+        def mock_process_document(url):
+            return production_sdk.ProcessingResult(url=url, status="completed")
+
+        urls = ["https://example.com/a", "https://example.com/b", "https://example.com/a"]
+        with mock.patch.object(production_sdk, "aiohttp", None), \
+                mock.patch.object(self.processor, "process_document", side_effect=mock_process_document) as process:
+            results = self.processor.process_batch(urls, progress_callback=lambda completed, total: None)
+
+        self.assertEqual(process.call_count, 2)
+        self.assertEqual([result.url for result in results], urls)
+        self.assertIs(results[0], results[2])
+
+    def test_process_batch_api_short_response_fails_chunk(self):
+        short = mock.Mock(status_code=200, content=b'[{"status": "completed"}]')
+        full = mock.Mock(status_code=200, content=b'[{"status": "completed"}]')
+        urls = ["https://example.com/a", "https://example.com/b", "https://example.com/c"]
+        with mock.patch.object(self.processor.session, "post", side_effect=[short, full]):
+            results = self.processor.process_batch_api(urls, chunk_size=2)
+
+        self.assertEqual([result.url for result in results], urls)
+        self.assertEqual([result.status for result in results], ["failed", "failed", "completed"])
+
+    def test_process_batch_api_rejects_non_list_response(self):
+        wrapped = mock.Mock(status_code=200, content=b'{"results": [], "count": 0}')
+        non_objects = mock.Mock(status_code=200, content=b'["completed", "completed"]')
+        urls = ["https://example.com/a", "https://example.com/b"]
+        with mock.patch.object(self.processor.session, "post", side_effect=[wrapped, non_objects]):
+            results = self.processor.process_batch_api(urls + urls, chunk_size=2)
+
+        self.assertEqual([result.status for result in results], ["failed"] * 4)
+
+
+class SlowAPIHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    delay = 0.0
+    posted = []
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.posted.append(payload["url"])
+        time.sleep(self.delay)
+        data = json.dumps({"status": "completed"}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@unittest.skipIf(production_sdk.aiohttp is None, "aiohttp is not installed")
+class TestProcessBatchAsync(unittest.TestCase):
+    def setUp(self):
+        SlowAPIHandler.posted = []
+        server = ThreadingHTTPServer(("127.0.0.1", 0), SlowAPIHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+
+        with tempfile.NamedTemporaryFile("w", suffix=".yaml", delete=False) as config_file:
+            config_file.write(f'API_ENDPOINT: "http://127.0.0.1:{server.server_port}"\n')
+            config_file.write('API_KEY: "test-key"\n')
+        self.addCleanup(os.remove, config_file.name)
+        self.processor = production_sdk.DocumentProcessor(production_sdk.Config(config_file.name))
+        self.addCleanup(self.processor.close)
+
+    def test_queued_requests_do_not_time_out(self):
+        # 16 URLs two at a time take well over the timeout in total
+        urls = [f"https://example.com/doc{i}" for i in range(16)]
+        with mock.patch.object(SlowAPIHandler, "delay", 0.15), \
+                mock.patch.object(production_sdk, "REQUEST_TIMEOUT", 1):
+            results = self.processor.process_batch(
+                urls, max_workers=2, progress_callback=lambda completed, total: None
+            )
+
+        self.assertEqual([result.status for result in results], ["completed"] * len(urls))
+        self.assertEqual(sorted(SlowAPIHandler.posted), sorted(urls))
+
+    def test_timeout_is_reported(self):
+        no_retry = mock.Mock(total=0, backoff_factor=0, status_forcelist=set())
+        with mock.patch.object(SlowAPIHandler, "delay", 0.5), \
+                mock.patch.object(production_sdk, "REQUEST_TIMEOUT", 0.1), \
+                mock.patch.object(self.processor, "_retry", no_retry):
+            results = self.processor.process_batch(
+                ["https://example.com/doc1", "https://example.com/doc2"],
+                progress_callback=lambda completed, total: None
+            )
+
+        self.assertEqual([result.status for result in results], ["failed", "failed"])
+        self.assertTrue(all(result.error for result in results))
+
+
+if __name__ == "__main__":
+    unittest.main()